@@ -1,14 +1,13 @@
 import logging
 import os
-import random
 import re
 from abc import ABC, abstractmethod
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 from pathlib import Path
 
 import h5py
-import networkx as nx
 import nltk
 import numpy as np
 import pandas as pd
@@ -17,6 +16,8 @@ import torch
 import torch.nn.functional as F
 from imblearn.over_sampling import SMOTE
 from joblib import Parallel, delayed
+from numba import njit, prange
+from sklearn.neighbors import NearestNeighbors
 from torch.utils.data import Dataset, SubsetRandomSampler
 from torch.utils.data.dataset import random_split
 from torch_geometric.datasets import TUDataset
@@ -24,7 +25,7 @@ from torchvision.datasets import CIFAR100, STL10, FashionMNIST, ImageFolder
 from torchvision.transforms import transforms
 from tqdm import tqdm
 
-from utils.misc import to_molecule
+from utils.misc import detect_substructures
 
 
 class ConceptDataset(ABC, Dataset):
@@ -64,24 +65,33 @@ class ECGDataset(ConceptDataset):
         file_path = (
             data_dir / "mitbih_train.csv" if train else data_dir / "mitbih_test.csv"
         )
-        df = pd.read_csv(file_path)
-        X = df.iloc[:, :187].values
-        y = df.iloc[:, 187].values
+        arr = pd.read_csv(file_path, dtype=np.float32).to_numpy()
+        X = arr[:, :187]
+        y = arr[:, 187].astype(np.int64)
         if balance_dataset:
-            n_normal = np.count_nonzero(y == 0)
-            balancing_dic = {
-                0: n_normal,
-                1: int(n_normal / 4),
-                2: int(n_normal / 4),
-                3: int(n_normal / 4),
-                4: int(n_normal / 4),
-            }
-            smote = SMOTE(random_state=random_seed, sampling_strategy=balancing_dic)
+            n_normal = int(np.bincount(y)[0])
+            balancing_dic = {0: n_normal, **{c: n_normal // 4 for c in range(1, 5)}}
+            smote = SMOTE(
+                random_state=random_seed,
+                sampling_strategy=balancing_dic,
+                k_neighbors=NearestNeighbors(n_neighbors=6, n_jobs=-1),
+            )
             X, y = smote.fit_resample(X, y)
+        # ascontiguousarray is a no-op unless SMOTE (or the column slice
+        # above) left a strided or widened buffer behind
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        y = np.ascontiguousarray(y, dtype=np.int64)
         if binarize_label:
-            y = np.where(y >= 1, 1, 0)
-        self.X = torch.tensor(X, dtype=torch.float32).unsqueeze(1)
-        self.y = torch.tensor(y, dtype=torch.long)
+            np.minimum(y, 1, out=y)
+        self.X = torch.from_numpy(X).unsqueeze_(1)
+        self.y = torch.from_numpy(y)
+        # Pin the full tensors once so batches can be copied to the GPU
+        # asynchronously; DataLoaders over this dataset should keep
+        # pin_memory=False since the underlying storage is already pinned
+        self.pinned = torch.cuda.is_available()
+        if self.pinned:
+            self.X = self.X.pin_memory()
+            self.y = self.y.pin_memory()
         self.binarize_label = binarize_label
 
     def __len__(self):
@@ -113,20 +123,17 @@ class ECGDataset(ConceptDataset):
         mask = self.y == concept_id + 1
         positive_idx = torch.nonzero(mask).flatten()
         negative_idx = torch.nonzero(~mask).flatten()
-        positive_loader = torch.utils.data.DataLoader(
-            self, batch_size=concept_set_size, sampler=SubsetRandomSampler(positive_idx)
-        )
-        negative_loader = torch.utils.data.DataLoader(
-            self, batch_size=concept_set_size, sampler=SubsetRandomSampler(negative_idx)
-        )
-        X_pos, C_pos = next(iter(positive_loader))
-        X_neg, C_neg = next(iter(negative_loader))
-        X = torch.concatenate((X_pos, X_neg), 0)
-        C = torch.concatenate(
-            (torch.ones(concept_set_size), torch.zeros(concept_set_size)), 0
-        )
-        rand_perm = torch.randperm(len(X))
-        return X[rand_perm], C[rand_perm]
+        positive_idx = positive_idx[
+            torch.randperm(positive_idx.numel())[:concept_set_size]
+        ]
+        negative_idx = negative_idx[
+            torch.randperm(negative_idx.numel())[:concept_set_size]
+        ]
+        idx = torch.cat((positive_idx, negative_idx))
+        C = torch.zeros(len(idx))
+        C[:concept_set_size] = 1
+        rand_perm = torch.randperm(len(idx))
+        return self.X.index_select(0, idx[rand_perm]), C[rand_perm]
 
     def concept_names(self):
         return ["Supraventricular", "Premature Ventricular", "Fusion Beats", "Unknown"]
@@ -134,12 +141,37 @@ class ECGDataset(ConceptDataset):
 
 class MutagenicityDataset(ConceptDataset, Dataset):
     def __init__(self, data_dir: Path, train: bool, random_seed: int = 11):
-        torch.manual_seed(random_seed)
-        dataset = TUDataset(str(data_dir), name="Mutagenicity").shuffle()
+        dataset = TUDataset(str(data_dir), name="Mutagenicity")
+        # Derive the split from a seed-local permutation rather than
+        # shuffling the whole dataset under the global torch seed
+        self.perm = torch.randperm(
+            len(dataset), generator=torch.Generator().manual_seed(random_seed)
+        )
+        split = len(dataset) // 10
         self.dataset = (
-            dataset[len(dataset) // 10 :] if train else dataset[: len(dataset) // 10]
+            dataset[self.perm[split:]] if train else dataset[self.perm[:split]]
         )
         self.random_seed = random_seed
+        # The permutation above is fixed by the seed, so the per-graph concept
+        # masks can be computed once and memoized on disk
+        split_name = "train" if train else "test"
+        # v2: masks written before the split-view indexing fix paired raw-order
+        # labels with permuted graphs; the new key leaves those files unread
+        mask_path = (
+            data_dir
+            / "Mutagenicity"
+            / f"concept_masks_v2_{split_name}_seed{random_seed}.npy"
+        )
+        if mask_path.exists():
+            masks = np.load(mask_path)
+        else:
+            rows = Parallel(n_jobs=-1, backend="loky", batch_size=64)(
+                delayed(detect_substructures)(self.dataset[i])
+                for i in range(len(self.dataset))
+            )
+            masks = np.asarray(rows, dtype=np.uint8).T
+            np.save(mask_path, masks)
+        self.concept_masks = torch.from_numpy(masks).bool()
 
     def __len__(self):
         return len(self.dataset)
@@ -148,78 +180,100 @@ class MutagenicityDataset(ConceptDataset, Dataset):
         return self.dataset.get(idx)
 
     def generate_concept_dataset(self, concept_id: int, concept_set_size: int) -> tuple:
-        concept_detectors = {
-            "Nitroso": self.is_nitroso,
-            "Aliphatic Halide": self.is_aliphatic_halide,
-            "Azo Type": self.is_azo_type,
-            "Nitro Type": self.is_nitro_type,
-        }
-        concept_detector = concept_detectors[self.concept_names()[concept_id]]
-        mask = []
-        for graph in iter(self.dataset):
-            molecule = to_molecule(graph)
-            mask.append(concept_detector(molecule))
-        mask = torch.tensor(mask)
-        positive_set = self.dataset[mask][:concept_set_size]
-        negative_set = self.dataset[~mask][:concept_set_size]
-        concept_set = positive_set + negative_set
+        mask = self.concept_masks[concept_id]
+        positive_idx = torch.nonzero(mask).flatten()[:concept_set_size]
+        negative_idx = torch.nonzero(~mask).flatten()[:concept_set_size]
+        concept_set = self.dataset[torch.cat((positive_idx, negative_idx))]
         C = torch.concatenate(
-            (torch.ones(len(positive_set)), torch.zeros(len(negative_set))), 0
+            (torch.ones(len(positive_idx)), torch.zeros(len(negative_idx))), 0
         )
         return concept_set, C
 
     def concept_names(self):
         return ["Nitroso", "Aliphatic Halide", "Azo Type", "Nitro Type"]
 
-    @staticmethod
-    def is_nitroso(molecule: nx.Graph) -> bool:
-        atoms = nx.get_node_attributes(molecule, "name")
-        valences = nx.get_edge_attributes(molecule, "valence")
-        for node1 in molecule.nodes:
-            if atoms[node1] == "N":
-                for node2 in molecule.adj[node1]:
-                    if atoms[node2] == "O" and valences[node1, node2] == 2:
-                        return True
-        return False
 
-    @staticmethod
-    def is_aliphatic_halide(molecule: nx.Graph) -> bool:
-        atoms = nx.get_node_attributes(molecule, "name")
-        for node1 in molecule.nodes:
-            if atoms[node1] in {"Cl", "Br", "I"}:
-                return True
-        return False
+def read_off(file):
+    header = file.readline().strip()
+    if "OFF" not in header:
+        raise ValueError("Not a valid OFF header")
+    if header != "OFF":  # The header is merged with the first line
+        second_line = header.replace("OFF", "")
+    else:  # The second line can be read directly
+        second_line = file.readline()
+    n_verts, n_faces, __ = tuple([int(s) for s in second_line.strip().split(" ")])
+    verts = np.loadtxt(file, dtype=np.float32, max_rows=n_verts)
+    # Faces are stored as "3 i j k"; drop the leading vertex count
+    faces = np.loadtxt(file, dtype=np.int64, max_rows=n_faces)[:, 1:4]
+    return verts, faces
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def sample_mesh(verts, faces, k):
+    n_faces = faces.shape[0]
+
+    # Heron's formula over all faces
+    areas = np.empty(n_faces, dtype=np.float32)
+    for i in prange(n_faces):
+        i0, i1, i2 = faces[i, 0], faces[i, 1], faces[i, 2]
+        side_a = 0.0
+        side_b = 0.0
+        side_c = 0.0
+        for d in range(3):
+            e01 = verts[i0, d] - verts[i1, d]
+            e12 = verts[i1, d] - verts[i2, d]
+            e20 = verts[i2, d] - verts[i0, d]
+            side_a += e01 * e01
+            side_b += e12 * e12
+            side_c += e20 * e20
+        side_a = np.sqrt(side_a)
+        side_b = np.sqrt(side_b)
+        side_c = np.sqrt(side_c)
+        s = 0.5 * (side_a + side_b + side_c)
+        areas[i] = np.sqrt(max(s * (s - side_a) * (s - side_b) * (s - side_c), 0.0))
+
+    # Weighted face sampling via binary search on the cumulative areas
+    cum_areas = np.cumsum(areas)
+    total_area = cum_areas[-1]
+    sampled_points = np.empty((k, 3), dtype=np.float32)
+    for j in prange(k):
+        face_idx = np.searchsorted(cum_areas, np.random.random() * total_area)
+        if face_idx >= n_faces:
+            face_idx = n_faces - 1
+        i0, i1, i2 = faces[face_idx, 0], faces[face_idx, 1], faces[face_idx, 2]
+
+        # barycentric coordinates on a triangle
+        # https://mathworld.wolfram.com/BarycentricCoordinates.html
+        s = np.random.random()
+        t = np.random.random()
+        if s > t:
+            s, t = t, s
+        for d in range(3):
+            sampled_points[j, d] = (
+                s * verts[i0, d] + (t - s) * verts[i1, d] + (1 - t) * verts[i2, d]
+            )
 
-    @staticmethod
-    def is_azo_type(molecule: nx.Graph) -> bool:
-        atoms = nx.get_node_attributes(molecule, "name")
-        valences = nx.get_edge_attributes(molecule, "valence")
-        for node1 in molecule.nodes:
-            if atoms[node1] == "N":
-                for node2 in nx.neighbors(molecule, node1):
-                    if atoms[node2] == "N" and valences[node1, node2] == 2:
-                        return True
-        return False
+    return sampled_points
 
-    @staticmethod
-    def is_nitro_type(molecule: nx.Graph) -> bool:
-        atoms = nx.get_node_attributes(molecule, "name")
-        valences = nx.get_edge_attributes(molecule, "valence")
-        for node1 in molecule.nodes:
-            if atoms[node1] == "N":
-                has_single_NO = False
-                has_double_NO = False
-                for node2 in nx.neighbors(molecule, node1):
-                    if atoms[node2] == "O":
-                        match valences[node1, node2]:
-                            case 1:
-                                has_single_NO = True
-                            case 2:
-                                has_double_NO = True
-
-                if has_single_NO and has_double_NO:
-                    return True
-        return False
+
+class PointSampler(object):
+    def __init__(self, output_size):
+        assert isinstance(output_size, int)
+        self.output_size = output_size
+
+    def __call__(self, mesh):
+        verts, faces = mesh
+        # Sample in float32 throughout: downstream training only ever sees
+        # float32 tensors and the narrower dtype halves memory traffic
+        verts = np.asarray(verts, dtype=np.float32)
+        faces = np.asarray(faces, dtype=np.int64)
+        return sample_mesh(verts, faces, self.output_size)
+
+
+def process_off(file_adr):
+    with open(file_adr, "r") as f:
+        verts, faces = read_off(f)
+    return PointSampler(10000)((verts, faces))
 
 
 class ModelNet40Dataset(ConceptDataset):
@@ -243,32 +297,35 @@ class ModelNet40Dataset(ConceptDataset):
         if not data_dir.exists():
             os.makedirs(data_dir)
             self.download()
-        if not (self.data_dir / "ModelNet_40_npy").exists():
-            self.preprocess()
         if not (self.data_dir / "ModelNet40_cloud.h5").exists():
-            self.formatting()
+            self.preprocess()
 
         self.down_sample = down_sample
-        with h5py.File(self.data_dir / "ModelNet40_cloud.h5", "r") as f:
-            if train:
-                self.X = np.array(f["tr_cloud"])
-                self.Y = np.array(f["tr_label"])
-            else:
-                self.X = np.array(f["test_cloud"])
-                self.Y = np.array(f["test_label"])
+        self.h5_path = self.data_dir / "ModelNet40_cloud.h5"
+        self.cloud_key = "tr_cloud" if train else "test_cloud"
+        # The clouds are read lazily per-worker; only the small label
+        # array is kept in memory
+        self._h5 = None
+        with h5py.File(self.h5_path, "r") as f:
+            self.Y = np.array(f["tr_label" if train else "test_label"])
+            n_points = f[self.cloud_key].shape[1]
 
         self.num_classes = np.max(self.Y) + 1
         self.prep = self.standardize if do_standardize else lambda x: x
 
         # Select the subset of points to use throughout beforehand
         np.random.seed(random_seed)
-        self.perm = np.random.permutation(self.X.shape[1])[:: self.down_sample]
+        self.perm = np.random.permutation(n_points)[:: self.down_sample]
 
     def __len__(self):
-        return len(self.X)
+        return len(self.Y)
 
     def __getitem__(self, idx):
-        x = self.prep(self.X[idx, self.perm])
+        if self._h5 is None:
+            # Open on first access so that each DataLoader worker holds
+            # its own handle instead of sharing one across forks
+            self._h5 = h5py.File(self.h5_path, "r")
+        x = self.prep(self._h5[self.cloud_key][idx][self.perm])
         y = self.Y[idx]
         return torch.tensor(x, dtype=torch.float32), torch.tensor(y, dtype=torch.long)
 
@@ -289,239 +346,48 @@ class ModelNet40Dataset(ConceptDataset):
         Preprocessing code adapted from https://github.com/michaelsdr/sinkformers/blob/main/model_net_40/to_h5.py
         :return:
         """
-        random.seed(self.random_seed)
         path = self.data_dir / "ModelNet40"
         folders = [dir for dir in sorted(os.listdir(path)) if os.path.isdir(path / dir)]
         classes = {folder: i for i, folder in enumerate(folders)}
 
-        def read_off(file):
-            header = file.readline().strip()
-            if "OFF" not in header:
-                raise ValueError("Not a valid OFF header")
-            if header != "OFF":  # The header is merged with the first line
-                second_line = header.replace("OFF", "")
-            else:  # The second line can be read directly
-                second_line = file.readline()
-            n_verts, n_faces, __ = tuple(
-                [int(s) for s in second_line.strip().split(" ")]
-            )
-            verts = [
-                [float(s) for s in file.readline().strip().split(" ")]
-                for i_vert in range(n_verts)
-            ]
-            faces = [
-                [int(s) for s in file.readline().strip().split(" ")][1:]
-                for i_face in range(n_faces)
-            ]
-            return verts, faces
-
-        with open(path / "bed/train/bed_0001.off", "r") as f:
-            verts, faces = read_off(f)
-
-        i, j, k = np.array(faces).T
-        x, y, z = np.array(verts).T
-
-        class PointSampler(object):
-            def __init__(self, output_size):
-                assert isinstance(output_size, int)
-                self.output_size = output_size
-
-            def triangle_area(self, pt1, pt2, pt3):
-                side_a = np.linalg.norm(pt1 - pt2)
-                side_b = np.linalg.norm(pt2 - pt3)
-                side_c = np.linalg.norm(pt3 - pt1)
-                s = 0.5 * (side_a + side_b + side_c)
-                return max(s * (s - side_a) * (s - side_b) * (s - side_c), 0) ** 0.5
-
-            def sample_point(self, pt1, pt2, pt3):
-                # barycentric coordinates on a triangle
-                # https://mathworld.wolfram.com/BarycentricCoordinates.html
-                s, t = sorted([random.random(), random.random()])
-                f = lambda i: s * pt1[i] + (t - s) * pt2[i] + (1 - t) * pt3[i]
-                return (f(0), f(1), f(2))
-
-            def __call__(self, mesh):
-                verts, faces = mesh
-                verts = np.array(verts)
-                areas = np.zeros((len(faces)))
-
-                for i in range(len(areas)):
-                    areas[i] = self.triangle_area(
-                        verts[faces[i][0]], verts[faces[i][1]], verts[faces[i][2]]
-                    )
-
-                sampled_faces = random.choices(
-                    faces, weights=areas, cum_weights=None, k=self.output_size
+        def gather(folder):
+            files_adr = []
+            labels = []
+            for category in classes.keys():
+                new_dir = path / Path(category) / folder
+                for file in sorted(os.listdir(new_dir)):
+                    if (new_dir / file).suffix == ".off":
+                        files_adr.append(new_dir / file)
+                        labels.append(classes[category])
+            return files_adr, np.asarray(labels)
+
+        with h5py.File(
+            self.data_dir / "ModelNet40_cloud.h5", "w"
+        ) as f, ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for folder, label_key, cloud_key in (
+                ("train", "tr_label", "tr_cloud"),
+                ("test", "test_label", "test_cloud"),
+            ):
+                files_adr, labels = gather(folder)
+                f.create_dataset(label_key, data=labels)
+
+                logging.info(f"Now processing the {folder} files")
+                cloud = f.create_dataset(
+                    cloud_key,
+                    shape=(len(files_adr), 10000, 3),
+                    dtype="float32",
+                    chunks=(1, 10000, 3),
+                    compression="lzf",
                 )
-
-                sampled_points = np.zeros((self.output_size, 3))
-
-                for i in range(len(sampled_faces)):
-                    sampled_points[i] = self.sample_point(
-                        verts[sampled_faces[i][0]],
-                        verts[sampled_faces[i][1]],
-                        verts[sampled_faces[i][2]],
+                for i, pointcloud in enumerate(
+                    tqdm(
+                        executor.map(process_off, files_adr, chunksize=16),
+                        total=len(files_adr),
+                        leave=False,
+                        unit="files",
                     )
-
-                return sampled_points
-
-        pointcloud = PointSampler(10000)((verts, faces))
-
-        def process(file, file_adr, save_adr):
-            fname = save_adr / f"{file[:-4]}.npy"
-            if file_adr.suffix == ".off":
-                if not os.path.isfile(fname):
-                    with open(file_adr, "r") as f:
-                        verts, faces = read_off(f)
-                        pointcloud = PointSampler(10000)((verts, faces))
-                        np.save(fname, pointcloud)
-                else:
-                    pass
-
-        tr_label = []
-        tr_cloud = []
-        test_cloud = []
-        test_label = []
-
-        folder = "train"
-        root_dir = path
-        folders = [
-            dir for dir in sorted(os.listdir(root_dir)) if os.path.isdir(root_dir / dir)
-        ]
-        classes = {folder: i for i, folder in enumerate(folders)}
-        files = []
-
-        all_files = []
-        all_files_adr = []
-        all_save_adr = []
-
-        for category in classes.keys():
-            save_adr = self.data_dir / f"ModelNet_40_npy/{category}/{folder}"
-            try:
-                os.makedirs(save_adr)
-            except:
-                pass
-            new_dir = root_dir / Path(category) / folder
-            for file in os.listdir(new_dir):
-                all_files.append(file)
-                all_files_adr.append(new_dir / file)
-                all_save_adr.append(save_adr)
-
-        logging.info("Now processing the training files")
-        Parallel(n_jobs=40)(
-            delayed(process)(file, file_adr, save_adr)
-            for (file, file_adr, save_adr) in tqdm(
-                zip(all_files, all_files_adr, all_save_adr), leave=False, unit="files"
-            )
-        )
-
-        folder = "test"
-        root_dir = path
-        folders = [
-            dir for dir in sorted(os.listdir(root_dir)) if os.path.isdir(root_dir / dir)
-        ]
-        classes = {folder: i for i, folder in enumerate(folders)}
-        files = []
-
-        all_files = []
-        all_files_adr = []
-        all_save_adr = []
-
-        for category in classes.keys():
-            save_adr = self.data_dir / f"ModelNet_40_npy/{category}/{folder}"
-            try:
-                os.makedirs(save_adr)
-            except:
-                pass
-            new_dir = root_dir / Path(category) / folder
-            for file in os.listdir(new_dir):
-                all_files.append(file)
-                all_files_adr.append(new_dir / file)
-                all_save_adr.append(save_adr)
-
-        logging.info("Now processing the test files")
-        Parallel(n_jobs=40)(
-            delayed(process)(file, file_adr, save_adr)
-            for (file, file_adr, save_adr) in tqdm(
-                zip(all_files, all_files_adr, all_save_adr), leave=False, unit="files"
-            )
-        )
-
-    def formatting(self) -> None:
-        """
-        Preprocessing code adapted from https://github.com/michaelsdr/sinkformers/blob/main/model_net_40/formatting.py
-        :return:
-        """
-        path = self.data_dir / "ModelNet_40_npy"
-
-        folders = [dir for dir in sorted(os.listdir(path)) if os.path.isdir(path / dir)]
-        classes = {folder: i for i, folder in enumerate(folders)}
-
-        tr_label = []
-        tr_cloud = []
-        test_cloud = []
-        test_label = []
-
-        logging.info("Now formatting training files")
-        folder = "train"
-        root_dir = path
-        folders = [
-            dir for dir in sorted(os.listdir(root_dir)) if os.path.isdir(root_dir / dir)
-        ]
-        classes = {folder: i for i, folder in enumerate(folders)}
-        files = []
-
-        all_files = []
-        all_files_adr = []
-        all_save_adr = []
-
-        for category, num in zip(classes.keys(), classes.values()):
-            new_dir = root_dir / Path(category) / folder
-
-            for file in os.listdir(new_dir):
-                if file.endswith(".npy"):
-                    try:
-                        point_cloud = np.load(new_dir / file)
-                        tr_cloud.append(point_cloud)
-                        tr_label.append(num)
-                    except:
-                        pass
-        tr_cloud = np.asarray(tr_cloud)
-        tr_label = np.asarray(tr_label)
-        np.save(str(self.data_dir / "tr_cloud.npy"), tr_cloud)
-        np.save(str(self.data_dir / "tr_label.npy"), tr_label)
-
-        logging.info("Now formatting test files")
-        folder = "test"
-        root_dir = path
-        folders = [
-            dir for dir in sorted(os.listdir(root_dir)) if os.path.isdir(root_dir / dir)
-        ]
-        classes = {folder: i for i, folder in enumerate(folders)}
-        files = []
-
-        for category, num in zip(classes.keys(), classes.values()):
-            new_dir = root_dir / Path(category) / folder
-
-            for file in os.listdir(new_dir):
-                if file.endswith(".npy"):
-                    try:
-                        point_cloud = np.load(new_dir / file)
-                        test_cloud.append(point_cloud)
-                        test_label.append(num)
-                    except:
-                        pass
-
-        test_cloud = np.asarray(test_cloud)
-        test_label = np.asarray(test_label)
-        np.save(str(self.data_dir / "test_cloud.npy"), test_cloud)
-        np.save(str(self.data_dir / "test_label.npy"), test_label)
-
-        with h5py.File(self.data_dir / "ModelNet40_cloud.h5", "w") as f:
-            f.create_dataset("test_cloud", data=test_cloud)
-            f.create_dataset("tr_cloud", data=tr_cloud)
-            f.create_dataset("test_label", data=test_label)
-            f.create_dataset("tr_label", data=tr_label)
+                ):
+                    cloud[i] = pointcloud
 
     def generate_concept_dataset(self, concept_id: int, concept_set_size: int) -> tuple:
         """
@@ -532,7 +398,7 @@ class ModelNet40Dataset(ConceptDataset):
         Returns:
             a concept dataset of the form X (features),C (concept labels)
         """
-        path = self.data_dir / "ModelNet_40_npy"
+        path = self.data_dir / "ModelNet40"
         classes = [dir for dir in sorted(os.listdir(path)) if os.path.isdir(path / dir)]
         concept_to_classes = {
             "Foot": {
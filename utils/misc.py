@@ -5,9 +5,26 @@ import logging
 from networkx import Graph
 from torch_geometric.data import Data as GraphData
 from torch_geometric.utils import to_networkx
-from typing import List
+from typing import List, Tuple
 from pathlib import Path
 
+ATOM_MAP = [
+    "C",
+    "O",
+    "Cl",
+    "H",
+    "N",
+    "F",
+    "Br",
+    "S",
+    "P",
+    "I",
+    "Na",
+    "K",
+    "Li",
+    "Ca",
+]
+
 
 def set_random_seed(seed: int) -> None:
     torch.manual_seed(seed)
@@ -24,22 +41,6 @@ def direct_sum(input_tensors):
 
 
 def to_molecule(data: GraphData) -> Graph:
-    ATOM_MAP = [
-        "C",
-        "O",
-        "Cl",
-        "H",
-        "N",
-        "F",
-        "Br",
-        "S",
-        "P",
-        "I",
-        "Na",
-        "K",
-        "Li",
-        "Ca",
-    ]
     g = to_networkx(data, node_attrs=["x"], edge_attrs=["edge_attr"])
     for u, data in g.nodes(data=True):
         data["name"] = ATOM_MAP[data["x"].index(1.0)]
@@ -50,6 +51,35 @@ def to_molecule(data: GraphData) -> Graph:
     return g
 
 
+def detect_substructures(data: GraphData) -> Tuple[bool, bool, bool, bool]:
+    """
+    Detect the Mutagenicity concept substructures directly on the graph tensors
+    Args:
+        data: torch_geometric graph of the molecule
+    Returns:
+        a (nitroso, aliphatic halide, azo type, nitro type) boolean tuple
+    """
+    atom = data.x.argmax(dim=1)
+    valence = data.edge_attr.argmax(dim=1) + 1
+    src, dst = data.edge_index
+    halides = [ATOM_MAP.index(name) for name in ("Cl", "Br", "I")]
+    nitrogen, oxygen = ATOM_MAP.index("N"), ATOM_MAP.index("O")
+
+    is_aliphatic_halide = bool(torch.isin(atom, torch.tensor(halides)).any())
+    n_src = atom[src] == nitrogen
+    o_dst = atom[dst] == oxygen
+    is_nitroso = bool((n_src & o_dst & (valence == 2)).any())
+    is_azo_type = bool((n_src & (atom[dst] == nitrogen) & (valence == 2)).any())
+    # Nitro type requires one nitrogen holding both a single and a double N-O bond
+    has_single_NO = torch.zeros(len(atom), dtype=torch.bool)
+    has_double_NO = torch.zeros(len(atom), dtype=torch.bool)
+    has_single_NO[src[n_src & o_dst & (valence == 1)]] = True
+    has_double_NO[src[n_src & o_dst & (valence == 2)]] = True
+    is_nitro_type = bool((has_single_NO & has_double_NO).any())
+
+    return is_nitroso, is_aliphatic_halide, is_azo_type, is_nitro_type
+
+
 def get_all_checkpoint_paths(checkpoint_dir: Path) -> List[Path]:
     """
     Returns the list of all checkpoints in the given directory